@@ -0,0 +1,84 @@
+"""Crypto primitives for the Python app server."""
+
+import base64
+from functools import lru_cache
+
+from blake3 import blake3
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+from better_auth.interfaces.crypto import IVerifier
+
+
+class Blake3Hasher:
+    """CESR-encoded Blake3-256 hasher."""
+
+    def sum_many(self, messages: list[str | bytes]) -> list[str]:
+        """Hash several messages synchronously in one loop."""
+        return [_encode_digest(blake3(_to_bytes(message)).digest()) for message in messages]
+
+
+class NativeSecp256r1Verifier(IVerifier):
+    """OpenSSL-backed verifier for CESR-encoded secp256r1 signatures."""
+
+    async def verify(self, message: str | bytes | memoryview, signature: str, public_key: str) -> None:
+        """Verify a signature over a message."""
+        verify_signature(message, signature, public_key)
+
+    def load_public_key(self, public_key: str) -> ec.EllipticCurvePublicKey:
+        """Decode a CESR-encoded public key once, for repeated verify_with_key calls."""
+        return _load_public_key(public_key)
+
+    async def verify_with_key(self, message: str | bytes | memoryview, signature: str, key: ec.EllipticCurvePublicKey) -> None:
+        """Verify a signature over a message with an already decoded public key."""
+        verify_signature_with_key(message, signature, key)
+
+
+# Shared instances, so any per-instance state (e.g. precomputed tables) is built once per process
+VERIFIER = NativeSecp256r1Verifier()
+HASHER = Blake3Hasher()
+
+
+def verify_signature(message: str | bytes | memoryview, signature: str, public_key: str) -> None:
+    """Verify a CESR-encoded secp256r1 signature synchronously."""
+    verify_signature_with_key(message, signature, _load_public_key(public_key))
+
+
+def verify_signature_with_key(message: str | bytes | memoryview, signature: str, key: ec.EllipticCurvePublicKey) -> None:
+    """Verify a CESR-encoded secp256r1 signature with a decoded public key."""
+    # 0I-coded raw r || s behind CESR lead bytes
+    raw_signature = base64.urlsafe_b64decode(signature)[2:]
+
+    der_signature = encode_dss_signature(
+        int.from_bytes(raw_signature[:32], 'big'),
+        int.from_bytes(raw_signature[32:], 'big')
+    )
+
+    try:
+        key.verify(der_signature, _to_bytes(message), ec.ECDSA(hashes.SHA256()))
+    except InvalidSignature:
+        raise ValueError('invalid signature')
+
+
+def verify_signatures(messages: list[str | bytes], signatures: list[str], public_keys: list[str]) -> None:
+    """Verify a batch of signatures synchronously, failing on the first bad one."""
+    for message, signature, public_key in zip(messages, signatures, public_keys, strict=True):
+        verify_signature(message, signature, public_key)
+
+
+@lru_cache(maxsize=4096)
+def _load_public_key(public_key: str) -> ec.EllipticCurvePublicKey:
+    """Decode a 1AAI-coded compressed point, memoized since the same keys verify repeatedly."""
+    return ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256R1(), base64.urlsafe_b64decode(public_key)[3:])
+
+
+def _to_bytes(message: str | bytes | memoryview) -> bytes | memoryview:
+    """Encode str messages; bytes-like messages pass through untouched."""
+    return message.encode() if isinstance(message, str) else message
+
+
+def _encode_digest(digest: bytes) -> str:
+    """Encode a 32-byte digest with the CESR Blake3-256 code."""
+    return 'E' + base64.urlsafe_b64encode(b'\x00' + digest).decode()[1:]
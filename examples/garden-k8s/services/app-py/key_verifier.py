@@ -1,11 +1,14 @@
 """HSM KeyVerifier with caching and 12-hour expiry."""
 
-import json
+import asyncio
+import bisect
 import logging
 import os
 import sys
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from typing import Dict, Optional
 
 import redis.asyncio as aioredis
@@ -21,12 +24,29 @@ else:
 sys.path.insert(0, better_auth_path)
 sys.path.insert(0, examples_path)
 
-from implementation.crypto.secp256r1 import Secp256r1Verifier
-from implementation.crypto.hash import Hasher
-from utils import get_sub_json
+from crypto import HASHER, VERIFIER, verify_signatures
+from utils import get_signed_json
 
 HSM_IDENTITY = "BETTER_AUTH_HSM_IDENTITY_PLACEHOLDER"
 
+# Batch size for SCAN hints and MGET round-trips against the HSM keys DB
+REDIS_BATCH_SIZE = 500
+
+# Connections kept open to the HSM keys DB; only cache refreshes use them
+REDIS_MAX_CONNECTIONS = 8
+
+# How long a command waits for a free pooled connection before failing
+REDIS_POOL_TIMEOUT_SECONDS = 5
+
+# Idle pooled connections are pinged before reuse once this old
+REDIS_HEALTH_CHECK_SECONDS = 30
+
+# Upper bound on cached HSM log entries
+MAX_CACHE_ENTRIES = 10_000
+
+# Stands in for the self-addressing id when hashing a payload
+ID_PLACEHOLDER = b'############################################'
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s: %(message)s',
@@ -34,6 +54,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def _with_placeholder(payload_json: bytes, payload: 'LogEntry') -> bytes:
+    """Replace the self-addressing id in a payload with the placeholder."""
+    # The inception entry's prefix is its id, so both are self-addressing there
+    if payload.sequence_number == 0 and payload.id != payload.prefix:
+        raise ValueError('prefix must equal id for sequence 0')
+
+    return payload_json.replace(payload.id.encode(), ID_PLACEHOLDER)
+
+
 class LogEntry:
     """HSM key log entry."""
     def __init__(self, data: Dict):
@@ -41,12 +71,17 @@ class LogEntry:
         self.prefix = data['prefix']
         self.previous = data.get('previous')
         self.sequence_number = data['sequenceNumber']
-        self.created_at = datetime.fromisoformat(data['createdAt'].replace('Z', '+00:00'))
+        self._created_at = data['createdAt']
         self.taint_previous = data.get('taintPrevious')
         self.purpose = data['purpose']
         self.public_key = data['publicKey']
         self.rotation_hash = data['rotationHash']
 
+    @cached_property
+    def created_at(self) -> datetime:
+        """Creation time, parsed on first use (fromisoformat accepts 'Z' since 3.11)."""
+        return datetime.fromisoformat(self._created_at)
+
 
 class SignedLogEntry:
     """Signed HSM key log entry."""
@@ -62,18 +97,33 @@ class ExpiringEntry:
     expiration: Optional[datetime]
 
 
+@dataclass
+class VerifiedTail:
+    """Last fully verified entry of a prefix chain."""
+    sequence_number: int
+    id: str
+    rotation_hash: str
+    created_at: datetime
+
+
 class KeyVerifier:
     """Verifies HSM signatures with caching."""
 
     def __init__(self, redis_host: str, redis_db_hsm_keys: int, server_lifetime_hours: int, access_lifetime_minutes: int):
-        self.redis_client = aioredis.from_url(
+        pool = aioredis.BlockingConnectionPool.from_url(
             f"redis://{redis_host}/{redis_db_hsm_keys}",
-            encoding="utf-8",
-            decode_responses=True
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT_SECONDS,
+            health_check_interval=REDIS_HEALTH_CHECK_SECONDS,
+            decode_responses=False
         )
-        self.verifier = Secp256r1Verifier()
-        self.hasher = Hasher()
-        self.cache: Dict[str, ExpiringEntry] = {}
+        self.redis_client = aioredis.Redis(connection_pool=pool)
+        self.verifier = VERIFIER
+        self.hasher = HASHER
+        self.cache: OrderedDict[str, ExpiringEntry] = OrderedDict()
+        self._refresh_lock = asyncio.Lock()
+        self._verified: Dict[str, bytes] = {}
+        self._verified_tail: Dict[str, VerifiedTail] = {}
         self.verification_window = timedelta(hours=server_lifetime_hours, minutes=access_lifetime_minutes)
 
     async def verify(
@@ -81,147 +131,222 @@ class KeyVerifier:
         signature: str,
         hsm_identity: str,
         hsm_generation_id: str,
-        message: str
+        message: str | bytes | memoryview
     ) -> None:
         """Verify a signature using HSM keys from Redis."""
+        # Expired entries stay cached until the next refresh, so requests naming
+        # them are rejected below without a reload
         cached_entry = self.cache.get(hsm_generation_id)
 
         if not cached_entry:
-            # Clear cache before repopulating
-            self.cache.clear()
-
-            # Fetch all HSM keys from Redis
-            keys = await self.redis_client.keys('*')
-            if not keys:
-                raise ValueError("No HSM keys found in Redis")
-
-            values = await self.redis_client.mget(keys)
-
-            # Group by prefix
-            by_prefix: Dict[str, list[tuple[SignedLogEntry, str]]] = {}
-
-            for value in values:
-                if not value:
-                    continue
-
-                payload_json = get_sub_json(value, "payload")
-                record = SignedLogEntry(json.loads(value))
-
-                prefix = record.payload.prefix
-
-                if prefix not in by_prefix:
-                    by_prefix[prefix] = []
-
-                by_prefix[prefix].append((record, payload_json))
-
-            # Sort by sequence number
-            for prefix in by_prefix:
-                by_prefix[prefix].sort(key=lambda r: r[0].payload.sequence_number)
-
-            # Verify data & signatures for all records
-            for prefix in by_prefix:
-                records = by_prefix[prefix]
+            # One refresh at a time; requests that queued behind it use its result
+            async with self._refresh_lock:
+                cached_entry = self.cache.get(hsm_generation_id)
+                if not cached_entry:
+                    await self._refresh()
+                    cached_entry = self.cache.get(hsm_generation_id)
 
-                for record, payload_json in records:
-                    payload = record.payload
-
-                    if payload.sequence_number == 0:
-                        await self._verify_prefix_and_data(payload_json, payload)
-                    else:
-                        await self._verify_address_and_data(payload_json, payload)
-
-                    await self.verifier.verify(payload_json, record.signature, payload.public_key)
+            if not cached_entry:
+                raise ValueError("can't find valid public key")
 
-            # Verify chains
-            for records in by_prefix.values():
-                last_id = ''
-                last_rotation_hash = ''
-                last_created_at = datetime.min.replace(tzinfo=None)
+        if cached_entry.entry.prefix != hsm_identity:
+            raise ValueError('incorrect identity (expected hsm.identity == prefix)')
 
-                for i, (record, _) in enumerate(records):
-                    payload = record.payload
+        if cached_entry.entry.purpose != 'key-authorization':
+            raise ValueError('incorrect purpose (expected key-authorization)')
 
-                    if payload.sequence_number != i:
-                        raise ValueError('bad sequence number')
+        if cached_entry.expiration is not None and cached_entry.expiration < datetime.now(cached_entry.entry.created_at.tzinfo):
+            raise ValueError('expired key')
 
-                    # Validate timestamp ordering
-                    if payload.created_at >= datetime.now(payload.created_at.tzinfo):
-                        raise ValueError('future timestamp')
+        # Verify message signature
+        await self.verifier.verify(message, signature, cached_entry.entry.public_key)
 
-                    if payload.sequence_number != 0:
-                        if last_id != payload.previous:
-                            raise ValueError('broken chain')
+    async def _refresh(self) -> None:
+        """Reload and verify the HSM log, then cache the HSM identity's current window."""
+        # Clear cache before repopulating
+        self.cache.clear()
 
-                        if payload.created_at <= last_created_at:
-                            raise ValueError('non-increasing timestamp')
+        # Fetch all HSM keys from Redis
+        values = await self._fetch_records()
 
-                        hash = await self.hasher.sum(payload.public_key)
+        # Group by prefix
+        by_prefix: Dict[str, list[tuple[SignedLogEntry, bytes]]] = {}
 
-                        if hash != last_rotation_hash:
-                            raise ValueError('bad commitment')
+        for value in values:
+            if not value:
+                continue
 
-                    last_id = payload.id
-                    last_rotation_hash = payload.rotation_hash
-                    last_created_at = payload.created_at
+            # The signature and id commit to the exact payload bytes, so the
+            # payload is sliced from the record rather than re-serialized
+            parsed, payload_json = get_signed_json(value, "payload")
+            record = SignedLogEntry(parsed)
 
-            # Verify prefix exists
-            if HSM_IDENTITY not in by_prefix:
-                raise ValueError('hsm identity not found')
+            prefix = record.payload.prefix
 
-            records = by_prefix[HSM_IDENTITY]
+            if prefix not in by_prefix:
+                by_prefix[prefix] = []
 
-            # Cache entries within 12-hour window (iterate backwards)
-            tainted = False
-            expiration: Optional[datetime] = None
-            for record, _ in reversed(records):
-                payload = record.payload
+            by_prefix[prefix].append((record, payload_json))
 
-                if not tainted:
-                    self.cache[payload.id] = ExpiringEntry(
-                        entry=payload,
-                        expiration=expiration
-                    )
+        # Sort by sequence number
+        for prefix in by_prefix:
+            by_prefix[prefix].sort(key=lambda r: r[0].payload.sequence_number)
 
-                tainted = True if payload.taint_previous == True else False
+        # Verify data and chains, then signatures for records not verified on a previous pass
+        for prefix, records in by_prefix.items():
+            self._verify_records(prefix, records)
 
-                exp = payload.created_at + self.verification_window
-                expiration = exp
+        pending = [
+            (record, payload_json)
+            for records in by_prefix.values()
+            for record, payload_json in records
+            if self._verified.get(record.payload.id) != payload_json
+        ]
 
-                if exp < datetime.now(payload.created_at.tzinfo):
-                    break
+        verify_signatures(
+            [payload_json for _, payload_json in pending],
+            [record.signature for record, _ in pending],
+            [record.payload.public_key for record, _ in pending]
+        )
 
-            cached_entry = self.cache.get(hsm_generation_id)
-            if not cached_entry:
-                raise ValueError("can't find valid public key")
+        # Remember verified entries so later passes only check new ones
+        for prefix, records in by_prefix.items():
+            for record, payload_json in records:
+                self._verified[record.payload.id] = payload_json
+
+            tail = records[-1][0].payload
+            self._verified_tail[prefix] = VerifiedTail(
+                sequence_number=tail.sequence_number,
+                id=tail.id,
+                rotation_hash=tail.rotation_hash,
+                created_at=tail.created_at
+            )
+
+        # Verify prefix exists
+        if HSM_IDENTITY not in by_prefix:
+            raise ValueError('hsm identity not found')
+
+        records = by_prefix[HSM_IDENTITY]
+
+        # Cache entries within 12-hour window. An entry stays valid until its
+        # successor's window closes, so start one before the first record
+        # created after the cutoff (records are ordered by creation time)
+        now = datetime.now(records[-1][0].payload.created_at.tzinfo)
+        cutoff = now - self.verification_window
+        start = max(bisect.bisect_left(records, cutoff, key=lambda r: r[0].payload.created_at) - 1, 0)
+
+        # Iterate backwards to carry expiration and taint to older entries
+        tainted = False
+        expiration: Optional[datetime] = None
+        entries: list[ExpiringEntry] = []
+        for record, _ in reversed(records[start:]):
+            payload = record.payload
+
+            if not tainted:
+                entries.append(ExpiringEntry(
+                    entry=payload,
+                    expiration=expiration
+                ))
+
+            tainted = True if payload.taint_previous == True else False
+
+            expiration = payload.created_at + self.verification_window
+
+        # Insert oldest first so the front of the cache expires first
+        self.cache.update((entry.entry.id, entry) for entry in reversed(entries))
+
+        self._evict_expired()
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries from the front of the cache and bound its size."""
+        while self.cache:
+            oldest = next(iter(self.cache.values()))
+            if oldest.expiration is None or oldest.expiration >= datetime.now(oldest.expiration.tzinfo):
+                break
+            self.cache.popitem(last=False)
+
+        while len(self.cache) > MAX_CACHE_ENTRIES:
+            self.cache.popitem(last=False)
+
+    def _verified_length(self, prefix: str, records: list[tuple[SignedLogEntry, bytes]]) -> int:
+        """Return how many leading records of a prefix were verified on a previous pass."""
+        tail = self._verified_tail.get(prefix)
+        if tail is None or len(records) <= tail.sequence_number:
+            return 0
+
+        for i, (record, payload_json) in enumerate(records[:tail.sequence_number + 1]):
+            payload = record.payload
+            if payload.sequence_number != i or self._verified.get(payload.id) != payload_json:
+                return 0
+
+        if records[tail.sequence_number][0].payload.id != tail.id:
+            return 0
+
+        return tail.sequence_number + 1
+
+    async def _fetch_records(self) -> list[Optional[bytes]]:
+        """Fetch all HSM records without blocking Redis on a full KEYS walk."""
+        # SCAN may return a key more than once, which would duplicate its record
+        keys = list(dict.fromkeys([key async for key in self.redis_client.scan_iter(count=REDIS_BATCH_SIZE)]))
+        if not keys:
+            raise ValueError("No HSM keys found in Redis")
+
+        values: list[Optional[bytes]] = []
+        for i in range(0, len(keys), REDIS_BATCH_SIZE):
+            values.extend(await self.redis_client.mget(keys[i:i + REDIS_BATCH_SIZE]))
+
+        return values
+
+    def _verify_records(self, prefix: str, records: list[tuple[SignedLogEntry, bytes]]) -> None:
+        """Verify data and chain of a prefix in one pass, resuming after the verified tail where possible."""
+        start = self._verified_length(prefix, records)
+
+        if start == 0:
+            last_id = ''
+            last_rotation_hash = ''
+            last_created_at = datetime.min.replace(tzinfo=None)
+        else:
+            tail = self._verified_tail[prefix]
+            last_id = tail.id
+            last_rotation_hash = tail.rotation_hash
+            last_created_at = tail.created_at
+
+        # Hash every id and commitment this pass needs in one batch
+        new_records = records[start:]
+        hashes = self.hasher.sum_many(
+            [_with_placeholder(payload_json, record.payload) for record, payload_json in new_records] +
+            [record.payload.public_key for record, _ in new_records]
+        )
 
-        if cached_entry.entry.prefix != hsm_identity:
-            raise ValueError('incorrect identity (expected hsm.identity == prefix)')
+        now = datetime.now(timezone.utc)
 
-        if cached_entry.entry.purpose != 'key-authorization':
-            raise ValueError('incorrect purpose (expected key-authorization)')
+        for i, (record, _) in enumerate(new_records):
+            payload = record.payload
 
-        if cached_entry.expiration is not None and cached_entry.expiration < datetime.now(cached_entry.entry.created_at.tzinfo):
-            raise ValueError('expired key')
+            if payload.sequence_number != start + i:
+                raise ValueError('bad sequence number')
 
-        # Verify message signature
-        await self.verifier.verify(message, signature, cached_entry.entry.public_key)
+            if hashes[i] != payload.id:
+                raise ValueError("id does not match")
 
-    async def _verify_prefix_and_data(self, payload_json: str, payload: LogEntry) -> None:
-        """Verify prefix and data for sequence 0."""
-        if payload.id != payload.prefix:
-            raise ValueError('prefix must equal id for sequence 0')
+            # Validate timestamp ordering
+            if payload.created_at >= now:
+                raise ValueError('future timestamp')
 
-        await self._verify_address_and_data(payload_json, payload)
+            if payload.sequence_number != 0:
+                if last_id != payload.previous:
+                    raise ValueError('broken chain')
 
-    async def _verify_address_and_data(self, payload_json: str, payload: LogEntry) -> None:
-        """Verify address and data."""
-        modified_payload = payload_json.replace(payload.id, '############################################')
+                if payload.created_at <= last_created_at:
+                    raise ValueError('non-increasing timestamp')
 
-        hash = await self.hasher.sum(modified_payload)
+                if hashes[len(new_records) + i] != last_rotation_hash:
+                    raise ValueError('bad commitment')
 
-        if hash != payload.id:
-            raise ValueError("id does not match")
+            last_id = payload.id
+            last_rotation_hash = payload.rotation_hash
+            last_created_at = payload.created_at
 
     async def close(self) -> None:
         """Close Redis connection."""
-        await self.redis_client.aclose()
+        await self.redis_client.aclose(close_connection_pool=True)
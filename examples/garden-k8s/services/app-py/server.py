@@ -7,19 +7,19 @@ to verify authenticated access requests.
 
 import asyncio
 import base64
-import json
 import logging
 import os
-import signal
 import sys
-import threading
-from concurrent.futures import Future
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import httpx
 import redis.asyncio as aioredis
-from flask import Flask, request, Response
+import uvicorn
+from quart import Quart, request, Response
 
 # Add the better-auth-py implementation to the path
 # In Docker: /dependencies/better-auth-py
@@ -40,11 +40,12 @@ from better_auth.interfaces.storage import IServerTimeLockStore, IVerificationKe
 
 # Import reference implementations
 sys.path.insert(0, examples_path)
-from implementation.crypto.secp256r1 import Secp256r1, Secp256r1Verifier
+from implementation.crypto.secp256r1 import Secp256r1
 from implementation.encoding.timestamper import Rfc3339
 from implementation.encoding.token_encoder import TokenEncoder
+from crypto import VERIFIER, NativeSecp256r1Verifier
 from key_verifier import KeyVerifier
-from utils import get_sub_json
+from utils import find_signed_json
 
 # Configure logging
 logging.basicConfig(
@@ -54,15 +55,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+# Requests verified concurrently on the event loop
+MAX_CONCURRENT_REQUESTS = 64
+
+# Connections kept open per Redis DB: one for each request that may be in flight
+REDIS_MAX_CONNECTIONS = MAX_CONCURRENT_REQUESTS
+
+# How long a command waits for a free pooled connection before failing
+REDIS_POOL_TIMEOUT_SECONDS = 5
+
+# Idle pooled connections are pinged before reuse once this old
+REDIS_HEALTH_CHECK_SECONDS = 30
+
+# Connections kept open to the HSM, which is only called at startup
+HSM_MAX_CONNECTIONS = 4
+
+# How long a verified access key is served from memory, and how many are kept
+ACCESS_KEY_CACHE_SECONDS = 60
+MAX_CACHED_ACCESS_KEYS = 10_000
+
+# Headers added to every response, preflight or not
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+    (b'access-control-allow-headers', b'Content-Type, Authorization'),
+]
+
+
+class CorsMiddleware:
+    """ASGI middleware that answers CORS preflights and adds CORS headers to responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        # Preflights are answered here without entering the app
+        if scope['method'] == 'OPTIONS':
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [(b'content-length', b'0'), *CORS_HEADERS]
+            })
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        async def send_with_cors(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', ()), *CORS_HEADERS]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+app = Quart(__name__)
+app.asgi_app = CorsMiddleware(app.asgi_app)
 
 
 class VerificationKey(IVerificationKey):
     """Wrapper for a public key string that implements IVerificationKey."""
 
-    def __init__(self, public_key: str, verifier_instance: IVerifier):
+    def __init__(self, public_key: str, verifier_instance: NativeSecp256r1Verifier):
         self._public_key = public_key
         self._verifier = verifier_instance
+        # Decoded once here, so each verify goes straight to the curve arithmetic
+        self._key = verifier_instance.load_public_key(public_key)
 
     async def public(self) -> str:
         """Return the public key."""
@@ -74,69 +134,140 @@ class VerificationKey(IVerificationKey):
 
     async def verify(self, message: str, signature: str) -> None:
         """Verify a signature using the verifier and public key."""
-        await self._verifier.verify(message, signature, self._public_key)
+        await self._verifier.verify_with_key(message, signature, self._key)
+
+
+@dataclass
+class KeyResponse:
+    """HSM-signed key record, reduced to the fields the key store checks."""
+    signature: str
+    hsm_identity: str
+    hsm_generation_id: str
+    body: memoryview
+    purpose: Optional[str]
+    expiration: Optional[str]
+    public_key: Optional[str]
+
+
+def parse_key_response(buf: bytes) -> KeyResponse:
+    """Parse a key record in one pass, keeping the signed body as a view into buf."""
+    response_obj, body_start, body_end = find_signed_json(buf, "body")
+    body = response_obj['body']
+    hsm = body['hsm']
+    payload = body['payload']
+
+    return KeyResponse(
+        signature=response_obj['signature'],
+        hsm_identity=hsm['identity'],
+        hsm_generation_id=hsm['generationId'],
+        body=memoryview(buf)[body_start:body_end],
+        purpose=payload.get('purpose'),
+        expiration=payload.get('expiration'),
+        public_key=payload.get('publicKey')
+    )
 
 
 class RedisVerificationKeyStore(IVerificationKeyStore):
     """Redis-backed verification key store with HSM key verification."""
 
-    def __init__(self, redis_client: aioredis.Redis, redis_host: str, redis_db_hsm_keys: int, server_lifetime_hours: int, access_lifetime_minutes: int):
+    def __init__(self, redis_client: aioredis.Redis, verifier: NativeSecp256r1Verifier, redis_host: str, redis_db_hsm_keys: int, server_lifetime_hours: int, access_lifetime_minutes: int):
         self.redis_client = redis_client
         self.key_verifier = KeyVerifier(redis_host, redis_db_hsm_keys, server_lifetime_hours, access_lifetime_minutes)
-        self.verifier = Secp256r1Verifier()
+        self.verifier = verifier
+        self._cache: OrderedDict[str, tuple[float, VerificationKey]] = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
 
     async def get(self, identity: str) -> IVerificationKey:
-        """Get a verification key from Redis."""
+        """Get a verification key, from memory if it was verified recently."""
+        key = self._cached(identity)
+        if key is not None:
+            return key
+
+        # One lookup per identity at a time, so a burst of requests verifies once
+        lock = self._locks.setdefault(identity, asyncio.Lock())
+        try:
+            async with lock:
+                key = self._cached(identity)
+                if key is not None:
+                    return key
+
+                key, expiration = await self._fetch(identity)
+
+                # Serve from memory until the key expires, for at most the cache window
+                lifetime = ACCESS_KEY_CACHE_SECONDS
+                if expiration is not None:
+                    lifetime = min(lifetime, (expiration - datetime.now(expiration.tzinfo)).total_seconds())
+
+                self._cache[identity] = (time.monotonic() + lifetime, key)
+                self._cache.move_to_end(identity)
+                while len(self._cache) > MAX_CACHED_ACCESS_KEYS:
+                    self._cache.popitem(last=False)
+
+                return key
+        finally:
+            if not lock.locked():
+                self._locks.pop(identity, None)
+
+    def _cached(self, identity: str) -> Optional[VerificationKey]:
+        """Return a cached key that has not yet expired."""
+        entry = self._cache.get(identity)
+        if entry is None:
+            return None
+
+        expires_at, key = entry
+        if expires_at <= time.monotonic():
+            del self._cache[identity]
+            return None
+
+        self._cache.move_to_end(identity)
+        return key
+
+    async def _fetch(self, identity: str) -> tuple[VerificationKey, Optional[datetime]]:
+        """Get a verification key from Redis and verify it, returning it with its expiration."""
         value = await self.redis_client.get(identity)
         if value is None:
             raise ValueError(f"Key not found for identity: {identity}")
 
-        # Decode bytes to string if necessary
-        if isinstance(value, bytes):
-            value = value.decode('utf-8')
-
-        # Parse the response structure
-        response_obj = json.loads(value)
-        body_json = get_sub_json(value, "body")
+        response = parse_key_response(value)
 
         # Verify HSM signature using KeyVerifier
         await self.key_verifier.verify(
-            response_obj['signature'],
-            response_obj['body']['hsm']['identity'],
-            response_obj['body']['hsm']['generationId'],
-            body_json
+            response.signature,
+            response.hsm_identity,
+            response.hsm_generation_id,
+            response.body
         )
 
         # Validate purpose
-        payload = response_obj['body']['payload']
-        if payload.get('purpose') != 'access':
-            raise ValueError(f"invalid purpose: expected access, got {payload.get('purpose')}")
+        if response.purpose != 'access':
+            raise ValueError(f"invalid purpose: expected access, got {response.purpose}")
 
         # Check expiration
-        expiration_str = payload.get('expiration')
+        expiration = None
+        expiration_str = response.expiration
         if expiration_str:
             expiration = datetime.fromisoformat(expiration_str.replace('Z', '+00:00'))
             if expiration <= datetime.now(expiration.tzinfo):
                 raise ValueError("key expired")
 
         # Return the public key from the payload
-        public_key = payload.get('publicKey')
-        if not public_key:
+        if not response.public_key:
             raise ValueError("missing publicKey in payload")
 
-        return VerificationKey(public_key, self.verifier)
+        return VerificationKey(response.public_key, self.verifier), expiration
 
     async def close(self) -> None:
         """Close KeyVerifier connection."""
         await self.key_verifier.close()
 
 
-class InMemoryTimeLockStore(IServerTimeLockStore):
-    """In-memory time-lock store for nonces with configurable window."""
+class RedisTimeLockStore(IServerTimeLockStore):
+    """Redis-backed time-lock store for nonces, shared by every server process."""
 
-    def __init__(self, lifetime_in_seconds: int):
+    def __init__(self, redis_client: aioredis.Redis, lifetime_in_seconds: int):
+        self.redis_client = redis_client
         self._lifetime_in_seconds = lifetime_in_seconds
-        self._nonces: Dict[str, datetime] = {}
+        self._ttl_ms = lifetime_in_seconds * 1000
 
     @property
     def lifetime_in_seconds(self) -> int:
@@ -144,17 +275,11 @@ class InMemoryTimeLockStore(IServerTimeLockStore):
 
     async def reserve(self, value: str) -> None:
         """Reserve a value in the time-lock store."""
-        from datetime import timedelta
-
-        valid_at = self._nonces.get(value)
-        now = datetime.now()
-
-        if valid_at is not None and now < valid_at:
+        # SET NX PX reserves atomically, and Redis drops the key when the window ends
+        reserved = await self.redis_client.set(f"nonce:{value}", b"1", nx=True, px=self._ttl_ms)
+        if not reserved:
             raise RuntimeError("value reserved too recently")
 
-        new_valid_at = now + timedelta(seconds=self._lifetime_in_seconds)
-        self._nonces[value] = new_valid_at
-
 
 class ApplicationServer:
     """Application server that handles authenticated requests."""
@@ -162,14 +287,20 @@ class ApplicationServer:
     def __init__(self):
         self.verifier: Optional[AccessVerifier] = None
         self.response_key: Optional[ISigningKey] = None
+        self.response_identity: Optional[str] = None
         self.access_client: Optional[aioredis.Redis] = None
         self.revoked_devices_client: Optional[aioredis.Redis] = None
+        self.response_client: Optional[aioredis.Redis] = None
+        self.hsm_client: Optional[httpx.AsyncClient] = None
+        self.request_slots: Optional[asyncio.Semaphore] = None
 
     async def initialize(self) -> None:
         """Initialize the application server."""
         redis_host = os.environ.get('REDIS_HOST', 'redis:6379')
         logger.info(f"Connecting to Redis at {redis_host}")
 
+        self.request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
         server_lifetime_hours = 12
         access_lifetime_minutes = 15
 
@@ -186,187 +317,144 @@ class ApplicationServer:
             host = redis_host
             port = 6379
 
+        def connect(db: int) -> aioredis.Redis:
+            # A pool is bound to a single DB, so each DB gets its own long-lived pool
+            pool = aioredis.BlockingConnectionPool.from_url(
+                f"redis://{host}:{port}/{db}",
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT_SECONDS,
+                health_check_interval=REDIS_HEALTH_CHECK_SECONDS,
+                decode_responses=False  # We'll handle decoding ourselves
+            )
+            return aioredis.Redis(connection_pool=pool)
+
         # Connect to Redis DB 0 to read access keys
-        self.access_client = aioredis.Redis(
-            host=host,
-            port=port,
-            db=redis_db_access_keys,
-            decode_responses=False  # We'll handle decoding ourselves
-        )
+        self.access_client = connect(redis_db_access_keys)
 
         # Connect to Redis DB 3 to check revoked devices
-        self.revoked_devices_client = aioredis.Redis(
-            host=host,
-            port=port,
-            db=redis_db_revoked_devices,
-            decode_responses=False
-        )
+        self.revoked_devices_client = connect(redis_db_revoked_devices)
 
         # Connect to Redis DB 1 to write/read response keys
-        response_client = aioredis.Redis(
-            host=host,
-            port=port,
-            db=redis_db_response_keys,
-            decode_responses=False
-        )
+        self.response_client = connect(redis_db_response_keys)
 
-        try:
-            # Create verification key store
-            verifier = Secp256r1Verifier()
-            verification_key_store = RedisVerificationKeyStore(
-                self.access_client, redis_host, redis_db_hsm_keys, server_lifetime_hours, access_lifetime_minutes
-            )
+        # Create verification key store, sharing the process-wide verifier
+        verifier = VERIFIER
+        verification_key_store = RedisVerificationKeyStore(
+            self.access_client, verifier, redis_host, redis_db_hsm_keys, server_lifetime_hours, access_lifetime_minutes
+        )
 
-            # Create an in-memory nonce store with 30 second window
-            access_nonce_store = InMemoryTimeLockStore(30)
-
-            # Create AccessVerifier
-            self.verifier = AccessVerifier(
-                AccessVerifierConfig(
-                    crypto=AccessVerifierCryptoConfig(
-                        access_key_store=verification_key_store,
-                        verifier=verifier
-                    ),
-                    encoding=AccessVerifierEncodingConfig(
-                        token_encoder=TokenEncoder(),
-                        timestamper=Rfc3339()
-                    ),
-                    store=AccessVerifierStorageConfig(
-                        access=AccessVerifierStoreConfig(
-                            nonce=access_nonce_store
-                        )
+        # Create a Redis nonce store with 30 second window, next to the access keys
+        access_nonce_store = RedisTimeLockStore(self.access_client, 30)
+
+        # Create AccessVerifier
+        self.verifier = AccessVerifier(
+            AccessVerifierConfig(
+                crypto=AccessVerifierCryptoConfig(
+                    access_key_store=verification_key_store,
+                    verifier=verifier
+                ),
+                encoding=AccessVerifierEncodingConfig(
+                    token_encoder=TokenEncoder(),
+                    timestamper=Rfc3339()
+                ),
+                store=AccessVerifierStorageConfig(
+                    access=AccessVerifierStoreConfig(
+                        nonce=access_nonce_store
                     )
                 )
             )
+        )
 
-            logger.info("AccessVerifier initialized")
-
-            # Generate app response key
-            app_response_key = Secp256r1()
-            await app_response_key.generate()
-            app_response_public_key = await app_response_key.public()
-
-            # Sign response key with HSM
-            hsm_host = os.environ.get('HSM_HOST', 'hsm')
-            hsm_port = os.environ.get('HSM_PORT', '11111')
-            hsm_url = f"http://{hsm_host}:{hsm_port}"
-
-            ttl = 12 * 60 * 60 + 60  # 12 hours + 1 minute in seconds
-            timestamper = Rfc3339()
-            response_expiration = timestamper.format(datetime.now(timezone.utc) + timedelta(seconds=ttl))
-            response_payload = {
-                "purpose": "response",
-                "publicKey": app_response_public_key,
-                "expiration": response_expiration
-            }
-
-            authorization = None
-            try:
-                async with httpx.AsyncClient() as client:
-                    sign_response = await client.post(
-                        f"{hsm_url}/sign",
-                        json={"payload": response_payload}
-                    )
-                    if sign_response.status_code == 200:
-                        authorization = sign_response.text.rstrip()
-                        logger.info(f"Response key HSM authorization: {authorization}")
-                    else:
-                        logger.warning(f"Failed to sign response key with HSM: {sign_response.status_code}")
-            except Exception as e:
-                logger.warning(f"Failed to contact HSM: {e}")
-
-            # Store the full HSM authorization in Redis DB 1 with 12 hour 1 minute TTL
-            if authorization:
-                await response_client.set(app_response_public_key, authorization, ex=ttl)
-                logger.info(f"Registered app response key in Redis DB 1 (TTL: 12 hours): {app_response_public_key[:20]}...")
+        logger.info("AccessVerifier initialized")
+
+        # Generate app response key
+        app_response_key = Secp256r1()
+        await app_response_key.generate()
+        app_response_public_key = await app_response_key.public()
+
+        # Sign response key with HSM
+        hsm_host = os.environ.get('HSM_HOST', 'hsm')
+        hsm_port = os.environ.get('HSM_PORT', '11111')
+        hsm_url = f"http://{hsm_host}:{hsm_port}"
+
+        # Kept open for the server's lifetime so HSM calls reuse their connections
+        self.hsm_client = httpx.AsyncClient(
+            base_url=hsm_url,
+            limits=httpx.Limits(max_connections=HSM_MAX_CONNECTIONS)
+        )
+
+        ttl = 12 * 60 * 60 + 60  # 12 hours + 1 minute in seconds
+        timestamper = Rfc3339()
+        response_expiration = timestamper.format(datetime.now(timezone.utc) + timedelta(seconds=ttl))
+        response_payload = {
+            "purpose": "response",
+            "publicKey": app_response_public_key,
+            "expiration": response_expiration
+        }
+
+        authorization = None
+        try:
+            sign_response = await self.hsm_client.post(
+                "/sign",
+                json={"payload": response_payload}
+            )
+            if sign_response.status_code == 200:
+                authorization = sign_response.text.rstrip()
+                logger.info(f"Response key HSM authorization: {authorization}")
             else:
-                logger.error("No HSM authorization to store in Redis")
+                logger.warning(f"Failed to sign response key with HSM: {sign_response.status_code}")
+        except Exception as e:
+            logger.warning(f"Failed to contact HSM: {e}")
+
+        # Store the full HSM authorization in Redis DB 1 with 12 hour 1 minute TTL
+        if authorization:
+            await self.response_client.set(app_response_public_key, authorization, ex=ttl)
+            logger.info(f"Registered app response key in Redis DB 1 (TTL: 12 hours): {app_response_public_key[:20]}...")
+        else:
+            logger.error("No HSM authorization to store in Redis")
 
-            self.response_key = app_response_key
-        except:
-            raise
-        finally:
-            await response_client.aclose()
+        self.response_key = app_response_key
+        # The response key lives as long as the process, so its identity never changes
+        self.response_identity = await app_response_key.identity()
 
         logger.info("Application server initialized")
 
     async def cleanup(self) -> None:
         """Clean up resources."""
         if self.access_client:
-            await self.access_client.aclose()
+            await self.access_client.aclose(close_connection_pool=True)
         if self.revoked_devices_client:
-            await self.revoked_devices_client.aclose()
+            await self.revoked_devices_client.aclose(close_connection_pool=True)
+        if self.response_client:
+            await self.response_client.aclose(close_connection_pool=True)
+        if self.hsm_client:
+            await self.hsm_client.aclose()
 
 
 # Global server instance
 server_instance = ApplicationServer()
 
-# Event loop runner for async operations
-_loop = None
-_loop_thread = None
 
+@app.before_serving
+async def startup():
+    """Initialize the server on the serving event loop."""
+    await server_instance.initialize()
 
-def _run_event_loop(loop):
-    """Run the event loop in a dedicated thread."""
-    asyncio.set_event_loop(loop)
-    loop.run_forever()
 
-
-def run_async(coro):
-    """Run an async coroutine in the background event loop."""
-    if _loop is None:
-        raise RuntimeError("Event loop not initialized")
-
-    future = asyncio.run_coroutine_threadsafe(coro, _loop)
-    return future.result()
-
-
-@app.before_request
-def handle_cors_preflight():
-    """Handle CORS preflight requests."""
-    if request.method == 'OPTIONS':
-        response = Response()
-        response.headers['Access-Control-Allow-Origin'] = '*'
-        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-        return response
-
-
-@app.after_request
-def add_cors_headers(response):
-    """Add CORS headers to all responses."""
-    response.headers['Access-Control-Allow-Origin'] = '*'
-    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-    return response
+@app.after_serving
+async def shutdown():
+    """Clean up the server when serving stops."""
+    await server_instance.cleanup()
 
 
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint."""
     return {'status': 'healthy'}
 
 
-async def _handle_foo_bar_async(message: str) -> str:
-    """Async handler for foo/bar endpoint."""
-    # Verify access request
-    request_payload, token, nonce = await server_instance.verifier.verify(message)
-
-    # Check if device is revoked
-    is_revoked = await server_instance.revoked_devices_client.exists(token.device)
-    if is_revoked:
-        raise ValueError('device revoked')
-
-    # Check permissions
-    permissions_by_role = token.attributes.get('permissionsByRole', {})
-    user_permissions = permissions_by_role.get('user', [])
-
-    if not isinstance(user_permissions, list) or 'read' not in user_permissions:
-        raise ValueError('unauthorized')
-
-    # Get server identity
-    server_identity = await server_instance.response_key.identity()
-
+async def _sign_response(request_payload: Dict[str, Any], nonce: str) -> str:
+    """Build, sign and serialize the foo/bar response."""
     # Create response payload
     response_payload = {
         'wasFoo': request_payload['foo'],
@@ -375,20 +463,56 @@ async def _handle_foo_bar_async(message: str) -> str:
     }
 
     # Create and sign server response
-    response = ServerResponse(response_payload, server_identity, nonce)
+    response = ServerResponse(response_payload, server_instance.response_identity, nonce)
     await response.sign(server_instance.response_key)
     return await response.serialize()
 
 
+async def _handle_foo_bar_async(message: str) -> str:
+    """Async handler for foo/bar endpoint."""
+    # Bound how many verifications are in flight on the loop at once
+    async with server_instance.request_slots:
+        # Verify access request
+        request_payload, token, nonce = await server_instance.verifier.verify(message)
+
+        # Check permissions, without building throwaway defaults for missing keys
+        permissions_by_role = token.attributes.get('permissionsByRole')
+        user_permissions = permissions_by_role.get('user') if permissions_by_role else None
+
+        authorized = isinstance(user_permissions, list) and 'read' in user_permissions
+
+        # Check if device is revoked, signing the response in the meantime;
+        # a signing failure is held back so revocation still takes priority
+        revoked_check = server_instance.revoked_devices_client.exists(token.device)
+        if authorized:
+            is_revoked, reply = await asyncio.gather(
+                revoked_check, _sign_response(request_payload, nonce), return_exceptions=True
+            )
+            if isinstance(is_revoked, BaseException):
+                raise is_revoked
+        else:
+            is_revoked = await revoked_check
+
+        if is_revoked:
+            raise ValueError('device revoked')
+
+        if not authorized:
+            raise ValueError('unauthorized')
+
+        if isinstance(reply, BaseException):
+            raise reply
+
+        return reply
+
+
 @app.route('/foo/bar', methods=['POST'])
-def foo_bar():
+async def foo_bar():
     """Authenticated endpoint that processes foo/bar requests."""
     try:
         # Read request body
-        message = request.data.decode('utf-8')
+        message = (await request.get_data()).decode('utf-8')
 
-        # Run async handler in the background event loop
-        reply = run_async(_handle_foo_bar_async(message))
+        reply = await _handle_foo_bar_async(message)
         return Response(reply, content_type='application/json')
 
     except ValueError as e:
@@ -404,42 +528,18 @@ def foo_bar():
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
-def catch_all(path):
+async def catch_all(path):
     """Catch-all route for 404s."""
     return {'error': 'not found'}, 404
 
 
-def signal_handler(sig, frame):
-    """Handle shutdown signals."""
-    global _loop
-    logger.info("Shutdown signal received, cleaning up...")
-    if _loop:
-        asyncio.run_coroutine_threadsafe(server_instance.cleanup(), _loop).result()
-        _loop.call_soon_threadsafe(_loop.stop)
-    sys.exit(0)
-
-
 def main():
     """Main entry point."""
-    global _loop, _loop_thread
-
-    # Create and start event loop in a background thread
-    _loop = asyncio.new_event_loop()
-    _loop_thread = threading.Thread(target=_run_event_loop, args=(_loop,), daemon=True)
-    _loop_thread.start()
-
-    # Initialize server in the background event loop
-    future = asyncio.run_coroutine_threadsafe(server_instance.initialize(), _loop)
-    future.result()
-
-    # Register signal handlers
-    signal.signal(signal.SIGTERM, signal_handler)
-    signal.signal(signal.SIGINT, signal_handler)
-
-    # Start Flask server
     port = 80
+
+    # Start Quart under uvicorn; initialization and cleanup run in the serving hooks
     logger.info(f"Application server running on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    uvicorn.run(app, host='0.0.0.0', port=port, http='httptools', loop='uvloop', access_log=False)
 
 
 if __name__ == '__main__':
@@ -1,26 +1,84 @@
-def get_sub_json(data, label):
+import re
+
+import orjson
+
+# Runs of non-structural text and whole string literals (escapes included),
+# up to and capturing the next brace outside a string (possessive, so a
+# malformed value cannot backtrack)
+_NEXT_BRACE = re.compile(r'(?:[^{}"]++|"[^"\\]*+(?:\\.[^"\\]*+)*+")*+([{}])', re.DOTALL)
+_NEXT_BRACE_BYTES = re.compile(_NEXT_BRACE.pattern.encode(), re.DOTALL)
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+_WHITESPACE_BYTES = re.compile(_WHITESPACE.pattern.encode())
+
+
+def find_sub_json(data, label):
     query = f'"{label}":'
+    next_brace, whitespace, open_brace = _NEXT_BRACE, _WHITESPACE, '{'
+    if isinstance(data, bytes):
+        query = query.encode()
+        next_brace, whitespace, open_brace = _NEXT_BRACE_BYTES, _WHITESPACE_BYTES, b'{'
 
-    body_start = data.find(query) + len(query)
-    if body_start == -1 + len(query):
-        raise ValueError("missing body in response")
+    body_start = data.find(query)
+    if body_start == -1:
+        raise ValueError(f"missing {label} in response")
+    body_start = whitespace.match(data, body_start + len(query)).end()
+
+    if not data.startswith(open_brace, body_start):
+        raise ValueError(f"{label} is not an object")
 
     brace_count = 0
-    in_body = False
     body_end = -1
 
-    for i in range(body_start, len(data)):
-        char = data[i]
-        if char == '{':
-            in_body = True
+    # Braces inside string literals are consumed along with the literal
+    for match in next_brace.finditer(data, body_start):
+        if match.group(1) == open_brace:
             brace_count += 1
-        elif char == '}':
+        else:
             brace_count -= 1
-            if in_body and brace_count == 0:
-                body_end = i + 1
+            if brace_count == 0:
+                body_end = match.end()
                 break
 
     if body_end == -1:
         raise ValueError("failed to extract body from response")
 
-    return data[body_start:body_end]
+    return body_start, body_end
+
+
+def find_signed_json(data, label):
+    parsed = orjson.loads(data)
+
+    # orjson parses bytes directly, so raw Redis values need no decode
+    value = parsed.get(label)
+    if value is None:
+        raise ValueError(f"missing {label} in response")
+
+    query = f'"{label}":'
+    encoded = orjson.dumps(value)
+    if isinstance(data, str):
+        encoded = encoded.decode()
+    else:
+        query = query.encode()
+
+    body_start = data.find(query)
+    if body_start == -1:
+        raise ValueError(f"missing {label} in response")
+    body_start += len(query)
+
+    # The compact encoding of the parsed object gives the length of the raw
+    # slice; it is only trusted when it matches the original bytes exactly
+    if data.startswith(encoded, body_start):
+        return parsed, body_start, body_start + len(encoded)
+
+    # Otherwise the slice must hold the value that was parsed, or a duplicate
+    # key could have the signature checked over different data
+    body_start, body_end = find_sub_json(data, label)
+    if orjson.loads(data[body_start:body_end]) != value:
+        raise ValueError(f"ambiguous {label} in response")
+
+    return parsed, body_start, body_end
+
+
+def get_signed_json(data, label):
+    parsed, body_start, body_end = find_signed_json(data, label)
+    return parsed, data[body_start:body_end]